@@ -20,6 +20,32 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The agent card is static apart from its URL, which main() fills in from the
+# --host/--port options.
+_CAPABILITIES = AgentCapabilities(streaming=True)
+_SKILL = AgentSkill(
+    id='nextjs_development',
+    name='NextJS Development Assistant',
+    description='Helps with NextJS development including project setup, component creation, routing, data fetching, and best practices implementation.',
+    tags=['nextjs', 'react', 'frontend', 'web'],
+    examples=[
+        'How do I set up a new NextJS project with TypeScript?',
+        'Help me create a responsive navigation component in NextJS',
+        'What is the best way to implement API routes in NextJS?',
+        'Create a data fetching component using SWR in NextJS'
+    ],
+)
+_AGENT_CARD = AgentCard(
+    name='NextJS Development Agent',
+    description='This agent assists with NextJS development, providing guidance on project setup, component design, routing configuration, state management, and frontend best practices.',
+    url='',
+    version='1.0.0',
+    defaultInputModes=NextjsAgent.SUPPORTED_CONTENT_TYPES,
+    defaultOutputModes=NextjsAgent.SUPPORTED_CONTENT_TYPES,
+    capabilities=_CAPABILITIES,
+    skills=[_SKILL],
+)
+
 
 @click.command()
 @click.option('--host', default='localhost')
@@ -33,28 +59,8 @@ def main(host, port):
                     'GOOGLE_API_KEY environment variable not set and GOOGLE_GENAI_USE_VERTEXAI is not TRUE.'
                 )
 
-        capabilities = AgentCapabilities(streaming=True)
-        skill = AgentSkill(
-            id='nextjs_development',
-            name='NextJS Development Assistant',
-            description='Helps with NextJS development including project setup, component creation, routing, data fetching, and best practices implementation.',
-            tags=['nextjs', 'react', 'frontend', 'web'],
-            examples=[
-                'How do I set up a new NextJS project with TypeScript?',
-                'Help me create a responsive navigation component in NextJS',
-                'What is the best way to implement API routes in NextJS?',
-                'Create a data fetching component using SWR in NextJS'
-            ],
-        )
-        agent_card = AgentCard(
-            name='NextJS Development Agent',
-            description='This agent assists with NextJS development, providing guidance on project setup, component design, routing configuration, state management, and frontend best practices.',
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=NextjsAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=NextjsAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+        agent_card = _AGENT_CARD.model_copy(
+            update={'url': f'http://{host}:{port}/'}
         )
         server = A2AServer(
             agent_card=agent_card,
@@ -1,19 +1,58 @@
-import json
-import random
+import secrets
+import threading
 
 from typing import Any
 
+import orjson
+
+from cachetools import TTLCache
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools.tool_context import ToolContext
+from response_cache import ResponseCache
 from task_manager import AgentWithTaskManager
 
 
-# Local cache of created request_ids for demo purposes.
-request_ids = set()
+# Local cache of created request_ids for demo purposes. Ids expire after
+# REQUEST_ID_TTL seconds and the cache is bounded so a long-lived server does
+# not keep every id it ever issued. Tools may run on worker threads, so all
+# access goes through request_ids_lock.
+MAX_REQUEST_IDS = 100_000
+REQUEST_ID_TTL = 3600
+request_ids: TTLCache[str, bool] = TTLCache(
+    maxsize=MAX_REQUEST_IDS, ttl=REQUEST_ID_TTL
+)
+request_ids_lock = threading.Lock()
+
+
+# Field schema of the reimbursement form; identical for every return_form call.
+_FORM_PROPERTIES = {
+    'date': {
+        'type': 'string',
+        'format': 'date',
+        'description': 'Date of expense',
+        'title': 'Date',
+    },
+    'amount': {
+        'type': 'string',
+        'format': 'number',
+        'description': 'Amount of expense',
+        'title': 'Amount',
+    },
+    'purpose': {
+        'type': 'string',
+        'description': 'Purpose of expense',
+        'title': 'Purpose',
+    },
+    'request_id': {
+        'type': 'string',
+        'description': 'Request id',
+        'title': 'Request ID',
+    },
+}
 
 
 def create_request_form(
@@ -31,8 +70,9 @@ def create_request_form(
     Returns:
         dict[str, Any]: A dictionary containing the request form data.
     """
-    request_id = 'request_id_' + str(random.randint(1000000, 9999999))
-    request_ids.add(request_id)
+    request_id = 'request_id_' + secrets.token_hex(8)
+    with request_ids_lock:
+        request_ids[request_id] = True
     return {
         'request_id': request_id,
         'date': '<transaction date>' if not date else date,
@@ -59,7 +99,7 @@ def return_form(
         dict[str, Any]: A JSON dictionary for the form response.
     """
     if isinstance(form_request, str):
-        form_request = json.loads(form_request)
+        form_request = orjson.loads(form_request)
 
     tool_context.actions.skip_summarization = True
     tool_context.actions.escalate = True
@@ -67,41 +107,20 @@ def return_form(
         'type': 'form',
         'form': {
             'type': 'object',
-            'properties': {
-                'date': {
-                    'type': 'string',
-                    'format': 'date',
-                    'description': 'Date of expense',
-                    'title': 'Date',
-                },
-                'amount': {
-                    'type': 'string',
-                    'format': 'number',
-                    'description': 'Amount of expense',
-                    'title': 'Amount',
-                },
-                'purpose': {
-                    'type': 'string',
-                    'description': 'Purpose of expense',
-                    'title': 'Purpose',
-                },
-                'request_id': {
-                    'type': 'string',
-                    'description': 'Request id',
-                    'title': 'Request ID',
-                },
-            },
-            'required': list(form_request.keys()),
+            'properties': _FORM_PROPERTIES,
+            'required': list(form_request),
         },
         'form_data': form_request,
         'instructions': instructions,
     }
-    return json.dumps(form_dict)
+    return orjson.dumps(form_dict).decode()
 
 
 def reimburse(request_id: str) -> dict[str, Any]:
     """Reimburse the amount of money to the employee for a given request_id."""
-    if request_id not in request_ids:
+    with request_ids_lock:
+        is_known = request_id in request_ids
+    if not is_known:
         return {
             'request_id': request_id,
             'status': 'Error: Invalid request_id.',
@@ -109,35 +128,9 @@ def reimburse(request_id: str) -> dict[str, Any]:
     return {'request_id': request_id, 'status': 'approved'}
 
 
-class NextjsAgent(AgentWithTaskManager):
-    """An agent that handles reimbursement requests."""
-
-    SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
-
-    def __init__(self):
-        self._agent = self._build_agent()
-        self._user_id = 'remote_agent'
-        self._runner = Runner(
-            app_name=self._agent.name,
-            agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService(),
-        )
-
-    def get_processing_message(self) -> str:
-        return 'Processing the reimbursement request...'
-
-    def _build_agent(self) -> LlmAgent:
-        """The FastAPI Project Guideline agent."""
-        return LlmAgent(
-            model='gemini-2.0-flash-001',
-            name='FastAPI_Project_Guideline_agent',
-            description=(
-                'A structured guide for working with a FastAPI-based backend application, following a modular three-layer architecture (Router → Service → Repository).'
-                ' This document explains the directory layout, coding conventions, dependency injection, and testing practices, ensuring consistent and scalable backend development.'
-            ),
-            instruction="""
+# System prompt of the FastAPI guideline agent. It contains no
+# '{placeholders}', so ADK's session-state injection leaves it unchanged.
+_INSTRUCTION = """
     Here's a guideline document for using **FastAPI** in your project based on the structure you've provided. This is written in clear English, suitable for onboarding and documentation.
 
 ---
@@ -279,7 +272,67 @@ Maintain modularity by keeping each business domain self-contained. Follow this
 ---
 
 Let me know if you'd like this in Markdown format for documentation, or if you'd like to add sample templates.
-    """,
+    """
+
+
+# Runner services shared by every NextjsAgent in the process, created on first
+# use so that sessions and memory survive agents being rebuilt.
+_shared_services: (
+    tuple[InMemoryArtifactService, InMemorySessionService, InMemoryMemoryService]
+    | None
+) = None
+_shared_services_lock = threading.Lock()
+
+
+def _get_shared_services() -> tuple[
+    InMemoryArtifactService, InMemorySessionService, InMemoryMemoryService
+]:
+    """Returns the process-wide artifact, session and memory services."""
+    global _shared_services
+    if _shared_services is None:
+        with _shared_services_lock:
+            if _shared_services is None:
+                _shared_services = (
+                    InMemoryArtifactService(),
+                    InMemorySessionService(),
+                    InMemoryMemoryService(),
+                )
+    return _shared_services
+
+
+class NextjsAgent(AgentWithTaskManager):
+    """An agent that handles reimbursement requests."""
+
+    SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
+
+    def __init__(self):
+        artifact_service, session_service, memory_service = (
+            _get_shared_services()
+        )
+        self._agent = self._build_agent()
+        self._user_id = 'remote_agent'
+        self._runner = Runner(
+            app_name=self._agent.name,
+            agent=self._agent,
+            artifact_service=artifact_service,
+            session_service=session_service,
+            memory_service=memory_service,
+        )
+        self._response_cache = ResponseCache(maxsize=256)
+
+    def get_processing_message(self) -> str:
+        return 'Processing the reimbursement request...'
+
+    def _build_agent(self) -> LlmAgent:
+        """The FastAPI Project Guideline agent."""
+        return LlmAgent(
+            model='gemini-2.0-flash-001',
+            name='FastAPI_Project_Guideline_agent',
+            description=(
+                'A structured guide for working with a FastAPI-based backend application, following a modular three-layer architecture (Router → Service → Repository).'
+                ' This document explains the directory layout, coding conventions, dependency injection, and testing practices, ensuring consistent and scalable backend development.'
+            ),
+            instruction=_INSTRUCTION,
             tools=[
                 create_request_form,
                 reimburse,
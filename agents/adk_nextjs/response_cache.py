@@ -0,0 +1,58 @@
+"""Response cache for repeated prompts."""
+
+import threading
+
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """A thread-safe LRU cache mapping user prompts to final text responses.
+
+    Prompts are normalized (whitespace collapsed, case folded) so trivially
+    different phrasings of the same question share an entry.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize the cache storage.
+
+        Args:
+            maxsize: Maximum number of entries kept before the least recently
+                used one is evicted.
+        """
+        self._maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return ' '.join(query.split()).casefold()
+
+    def get(self, query: str) -> str | None:
+        """Get the cached response for a prompt.
+
+        Args:
+            query: The user prompt.
+
+        Returns:
+            The cached response, or None if the prompt has not been seen.
+        """
+        key = self._normalize(query)
+        with self._lock:
+            response = self._data.get(key)
+            if response is not None:
+                self._data.move_to_end(key)
+            return response
+
+    def set(self, query: str, response: str) -> None:
+        """Store the response for a prompt, evicting the oldest entry if full.
+
+        Args:
+            query: The user prompt.
+            response: The final text response produced for it.
+        """
+        key = self._normalize(query)
+        with self._lock:
+            self._data[key] = response
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
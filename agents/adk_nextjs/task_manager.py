@@ -1,10 +1,12 @@
-import json
+import asyncio
 import logging
 
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterable
 from typing import Any
 
+import orjson
+
 from common.server import utils
 from common.server.task_manager import InMemoryTaskManager
 from common.types import (
@@ -24,7 +26,10 @@ from common.types import (
     TaskStatusUpdateEvent,
     TextPart,
 )
+from google.adk.events import Event
+from google.adk.sessions import Session
 from google.genai import types
+from response_cache import ResponseCache
 
 
 logger = logging.getLogger(__name__)
@@ -32,6 +37,9 @@ logger = logging.getLogger(__name__)
 
 # TODO: Move this class (or these classes) to a common directory
 class AgentWithTaskManager(ABC):
+    # Optional cache of first-turn text answers; see response_cache.py.
+    _response_cache: ResponseCache | None = None
+
     @abstractmethod
     def get_processing_message(self) -> str:
         pass
@@ -45,13 +53,17 @@ class AgentWithTaskManager(ABC):
         content = types.Content(
             role='user', parts=[types.Part.from_text(text=query)]
         )
-        if session is None:
+        is_new_session = session is None
+        if is_new_session:
             session = self._runner.session_service.create_session(
                 app_name=self._agent.name,
                 user_id=self._user_id,
                 state={},
                 session_id=session_id,
             )
+            cached = self._get_cached_response(session, content, query)
+            if cached is not None:
+                return cached
         events = list(
             self._runner.run(
                 user_id=self._user_id,
@@ -61,7 +73,12 @@ class AgentWithTaskManager(ABC):
         )
         if not events or not events[-1].content or not events[-1].content.parts:
             return ''
-        return '\n'.join([p.text for p in events[-1].content.parts if p.text])
+        response = '\n'.join(
+            [p.text for p in events[-1].content.parts if p.text]
+        )
+        if is_new_session and not any(e.get_function_calls() for e in events):
+            self._set_cached_response(query, response)
+        return response
 
     async def stream(self, query, session_id) -> AsyncIterable[dict[str, Any]]:
         session = self._runner.session_service.get_session(
@@ -72,50 +89,89 @@ class AgentWithTaskManager(ABC):
         content = types.Content(
             role='user', parts=[types.Part.from_text(text=query)]
         )
-        if session is None:
+        is_new_session = session is None
+        if is_new_session:
             session = self._runner.session_service.create_session(
                 app_name=self._agent.name,
                 user_id=self._user_id,
                 state={},
                 session_id=session_id,
             )
-        async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
-        ):
-            if event.is_final_response():
-                response = ''
-                if (
-                    event.content
-                    and event.content.parts
-                    and event.content.parts[0].text
-                ):
-                    response = '\n'.join(
-                        [p.text for p in event.content.parts if p.text]
-                    )
-                elif (
-                    event.content
-                    and event.content.parts
-                    and any(
-                        [
-                            True
-                            for p in event.content.parts
-                            if p.function_response
-                        ]
-                    )
-                ):
-                    response = next(
-                        p.function_response.model_dump()
-                        for p in event.content.parts
-                    )
+            cached = self._get_cached_response(session, content, query)
+            if cached is not None:
                 yield {
                     'is_task_complete': True,
-                    'content': response,
+                    'content': cached,
                 }
-            else:
+                return
+        used_tools = False
+        processing_message = self.get_processing_message()
+        async for event in self._runner.run_async(
+            user_id=self._user_id, session_id=session.id, new_message=content
+        ):
+            if not used_tools and event.get_function_calls():
+                used_tools = True
+            if not event.is_final_response():
                 yield {
                     'is_task_complete': False,
-                    'updates': self.get_processing_message(),
+                    'updates': processing_message,
                 }
+                continue
+            response = ''
+            parts = event.content.parts if event.content else None
+            if parts and parts[0].text:
+                response = '\n'.join([p.text for p in parts if p.text])
+            elif parts and any(p.function_response for p in parts):
+                response = next(
+                    p.function_response.model_dump()
+                    for p in parts
+                    if p.function_response
+                )
+            if (
+                is_new_session
+                and not used_tools
+                and isinstance(response, str)
+                and response
+            ):
+                self._set_cached_response(query, response)
+            yield {
+                'is_task_complete': True,
+                'content': response,
+            }
+
+    def _get_cached_response(
+        self, session: Session, content: types.Content, query: str
+    ) -> str | None:
+        """Answers a fresh session from the response cache, if possible.
+
+        On a hit the prompt and cached answer are appended to the session so
+        follow-up turns still see the conversation history.
+        """
+        if self._response_cache is None:
+            return None
+        response = self._response_cache.get(query)
+        if response is None:
+            return None
+        invocation_id = Event.new_id()
+        self._runner.session_service.append_event(
+            session,
+            Event(invocation_id=invocation_id, author='user', content=content),
+        )
+        self._runner.session_service.append_event(
+            session,
+            Event(
+                invocation_id=invocation_id,
+                author=self._agent.name,
+                content=types.Content(
+                    role='model', parts=[types.Part.from_text(text=response)]
+                ),
+            ),
+        )
+        return response
+
+    def _set_cached_response(self, query: str, response: str) -> None:
+        if self._response_cache is not None and response:
+            self._response_cache.set(query, response)
 
 
 class AgentTaskManager(InMemoryTaskManager):
@@ -143,7 +199,7 @@ class AgentTaskManager(InMemoryTaskManager):
                             'response' in item['content']
                             and 'result' in item['content']['response']
                         ):
-                            data = json.loads(
+                            data = orjson.loads(
                                 item['content']['response']['result']
                             )
                             task_state = TaskState.INPUT_REQUIRED
@@ -251,7 +307,11 @@ class AgentTaskManager(InMemoryTaskManager):
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            result = self.agent.invoke(query, task_send_params.sessionId)
+            # Runner.run() blocks until the whole LLM turn completes; keep it
+            # off the event loop so other requests are served meanwhile.
+            result = await asyncio.to_thread(
+                self.agent.invoke, query, task_send_params.sessionId
+            )
         except Exception as e:
             logger.error(f'Error invoking agent: {e}')
             raise ValueError(f'Error invoking agent: {e}')
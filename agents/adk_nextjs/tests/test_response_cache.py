@@ -0,0 +1,163 @@
+import asyncio
+import unittest
+
+from collections.abc import AsyncGenerator
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from response_cache import ResponseCache
+from task_manager import AgentWithTaskManager
+
+
+class FakeLlm(BaseLlm):
+    """An LLM that replays scripted responses and counts its calls."""
+
+    responses: list[LlmResponse] = []
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        response = self.responses[self.calls % len(self.responses)]
+        self.calls += 1
+        yield response
+
+
+def text_response(text: str) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role='model', parts=[types.Part.from_text(text=text)]
+        )
+    )
+
+
+def tool_call_response() -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role='model',
+            parts=[
+                types.Part.from_function_call(name='lookup', args={'key': 'a'})
+            ],
+        )
+    )
+
+
+def lookup(key: str) -> dict[str, str]:
+    """Looks up a value by key."""
+    return {'key': key, 'value': 'found'}
+
+
+class CachingAgent(AgentWithTaskManager):
+    SUPPORTED_CONTENT_TYPES = ['text', 'text/plain']
+
+    def __init__(self, llm: FakeLlm):
+        self._agent = LlmAgent(model=llm, name='caching_agent', tools=[lookup])
+        self._user_id = 'test_user'
+        self._runner = Runner(
+            app_name=self._agent.name,
+            agent=self._agent,
+            session_service=InMemorySessionService(),
+        )
+        self._response_cache = ResponseCache()
+
+    def get_processing_message(self) -> str:
+        return 'Processing...'
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """Tests for the ResponseCache LRU."""
+
+    def test_get_normalizes_query(self) -> None:
+        cache = ResponseCache()
+        cache.set('What is  NextJS?', 'A framework.')
+        self.assertEqual(cache.get('  what is nextjs? '), 'A framework.')
+
+    def test_get_missing_query_returns_none(self) -> None:
+        self.assertIsNone(ResponseCache().get('unknown'))
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ResponseCache(maxsize=2)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        cache.get('a')
+        cache.set('c', '3')
+        self.assertEqual(cache.get('a'), '1')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), '3')
+
+
+class AgentWithTaskManagerCacheTest(unittest.TestCase):
+    """Tests for the response cache paths of AgentWithTaskManager."""
+
+    def _get_events(self, agent: CachingAgent, session_id: str) -> list:
+        session = agent._runner.session_service.get_session(
+            app_name=agent._agent.name,
+            user_id=agent._user_id,
+            session_id=session_id,
+        )
+        return session.events
+
+    def test_invoke_reuses_first_turn_answer(self) -> None:
+        llm = FakeLlm(model='fake', responses=[text_response('Hello!')])
+        agent = CachingAgent(llm)
+
+        self.assertEqual(agent.invoke('Hi', 'session-1'), 'Hello!')
+        self.assertEqual(agent.invoke('  hi ', 'session-2'), 'Hello!')
+        self.assertEqual(llm.calls, 1)
+
+    def test_invoke_cache_hit_records_session_history(self) -> None:
+        llm = FakeLlm(model='fake', responses=[text_response('Hello!')])
+        agent = CachingAgent(llm)
+        agent.invoke('Hi', 'session-1')
+
+        agent.invoke('Hi', 'session-2')
+
+        events = self._get_events(agent, 'session-2')
+        self.assertEqual([e.author for e in events], ['user', 'caching_agent'])
+        self.assertEqual(events[0].content.parts[0].text, 'Hi')
+        self.assertEqual(events[1].content.parts[0].text, 'Hello!')
+
+    def test_invoke_does_not_cache_follow_up_turns(self) -> None:
+        llm = FakeLlm(model='fake', responses=[text_response('Sure.')])
+        agent = CachingAgent(llm)
+        agent.invoke('Hi', 'session-1')
+        agent.invoke('Tell me more', 'session-1')
+
+        agent.invoke('Tell me more', 'session-2')
+
+        self.assertEqual(llm.calls, 3)
+
+    def test_invoke_does_not_cache_answers_that_used_tools(self) -> None:
+        llm = FakeLlm(
+            model='fake',
+            responses=[tool_call_response(), text_response('Found it.')],
+        )
+        agent = CachingAgent(llm)
+
+        self.assertEqual(agent.invoke('Look up a', 'session-1'), 'Found it.')
+        self.assertEqual(agent.invoke('Look up a', 'session-2'), 'Found it.')
+        self.assertEqual(llm.calls, 4)
+
+    def test_stream_serves_cached_answer(self) -> None:
+        llm = FakeLlm(model='fake', responses=[text_response('Hello!')])
+        agent = CachingAgent(llm)
+
+        async def collect(session_id: str) -> list[dict]:
+            return [item async for item in agent.stream('Hi', session_id)]
+
+        asyncio.run(collect('session-1'))
+        items = asyncio.run(collect('session-2'))
+
+        self.assertEqual(
+            items, [{'is_task_complete': True, 'content': 'Hello!'}]
+        )
+        self.assertEqual(llm.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()